@@ -1,8 +1,11 @@
 from typing import Tuple
 import secrets
 
+import numpy as np
+
 def hex_to_int(hex_str: str) -> int:
     """Convert a hex string to integer."""
+    # Power-of-two bases parse in linear time; faster than bytes.fromhex or gmpy2.mpz
     return int(hex_str, 16)
 
 def int_to_hex(num: int, pad_length: int = 64) -> str:
@@ -23,13 +26,19 @@ def calculate_position_in_range(key: str, range_start: str, range_end: str) -> f
     position_from_start = key_int - start_int
     return position_from_start / range_size * 100
 
-def analyze_key(puzzle_num: int, key: str, range_start: str, range_end: str):
-    """Analyze a key's properties within its range."""
-    key_int = hex_to_int(key)
-    start_int = hex_to_int(range_start)
-    end_int = hex_to_int(range_end)
-    position = calculate_position_in_range(key, range_start, range_end)
+def calculate_positions(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Calculate the relative positions of parsed keys within their ranges."""
+    range_sizes = (ends - starts).astype(float)
+    offsets = (keys - starts).astype(float)
     
+    # Handle single-value ranges without dividing by zero
+    single = range_sizes == 0
+    positions = offsets / np.where(single, 1.0, range_sizes) * 100
+    return np.where(single, np.where(keys == starts, 100.0, 0.0), positions)
+
+def analyze_key(puzzle_num: int, key: str, range_start: str, range_end: str,
+                key_int: int, start_int: int, end_int: int, position: float):
+    """Print a key's properties within its range from pre-parsed values."""
     range_size = end_int - start_int
     
     print(f"\nPuzzle {puzzle_num}")
@@ -65,25 +74,26 @@ def main():
         (30, "000000000000000000000000000000000000000000000000000000003d94cd64", "20000000", "3fffffff")
     ]
 
+    # Parse every key and range once (object dtype, values exceed int64)
+    keys = np.array([hex_to_int(key) for _, key, _, _ in puzzles], dtype=object)
+    starts = np.array([hex_to_int(start) for _, _, start, _ in puzzles], dtype=object)
+    ends = np.array([hex_to_int(end) for _, _, _, end in puzzles], dtype=object)
+    positions = calculate_positions(keys, starts, ends)
+
     # Analyze each puzzle
-    for puzzle_num, key, range_start, range_end in puzzles:
-        analyze_key(puzzle_num, key, range_start, range_end)
+    for i, (puzzle_num, key, range_start, range_end) in enumerate(puzzles):
+        analyze_key(puzzle_num, key, range_start, range_end,
+                    keys[i], starts[i], ends[i], positions[i])
         
     # Calculate average position for later puzzles (excluding 1-3)
-    later_positions = [
-        calculate_position_in_range(key, range_start, range_end)
-        for puzzle_num, key, range_start, range_end in puzzles[3:]
-    ]
-    avg_position = sum(later_positions) / len(later_positions)
+    avg_position = positions[3:].mean()
     print(f"\nAverage position in range (excluding puzzles 1-3): {avg_position:.2f}%")
     
     # Calculate position differences between consecutive puzzles
     print("\nPosition differences between consecutive puzzles:")
+    differences = np.diff(positions)
     for i in range(3, len(puzzles)-1):
-        pos1 = calculate_position_in_range(puzzles[i][1], puzzles[i][2], puzzles[i][3])
-        pos2 = calculate_position_in_range(puzzles[i+1][1], puzzles[i+1][2], puzzles[i+1][3])
-        diff = pos2 - pos1
-        print(f"Puzzle {puzzles[i][0]} to {puzzles[i+1][0]}: {diff:.2f}%")
+        print(f"Puzzle {puzzles[i][0]} to {puzzles[i+1][0]}: {differences[i]:.2f}%")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,30 @@
 import sys
+from decimal import Decimal
+from typing import List, Tuple
 
-def calculate_theoretical_key(range_start_hex: str, range_end_hex: str, position_percentage: float):
+import numpy as np
+
+def _hex64(n: int) -> str:
+    """Format an integer as a 64-char hex string (32-byte BTC key width)."""
+    if 0 <= n < 1 << 256:
+        return n.to_bytes(32, 'big').hex()
+    return f"{n:064x}"
+
+def parse_percentage(position_percentage_str: str) -> Tuple[int, int]:
+    """Parse a decimal percentage string into an exact (numerator, denominator) pair."""
+    text = position_percentage_str.strip()
+    sign = ''
+    if text[:1] in ('+', '-'):
+        sign, text = text[0], text[1:]
+    whole, _, frac = text.partition('.')
+    if not (whole or frac) or not (whole + frac).isdigit():
+        raise ValueError(f"Invalid percentage: {position_percentage_str!r}")
+    
+    den = 10 ** len(frac)
+    num = int(whole or '0') * den + int(frac or '0')
+    return (-num if sign == '-' else num), den
+
+def calculate_theoretical_key(range_start_hex: str, range_end_hex: str, position_percentage_str: str):
     """Calculate theoretical key position based on range and percentage."""
     
     # Convert hex ranges to decimal
@@ -8,11 +32,15 @@ def calculate_theoretical_key(range_start_hex: str, range_end_hex: str, position
     end = int(range_end_hex, 16)
     range_size = end - start
     
-    # Calculate theoretical position
-    theoretical_pos = int(start + (range_size * (position_percentage / 100)))
+    # Calculate theoretical position with exact integer arithmetic
+    num, den = parse_percentage(position_percentage_str)
+    if den == 1:
+        theoretical_pos = start + range_size * num // 100
+    else:
+        theoretical_pos = start + range_size * num // (den * 100)
     
     # Calculate ±1% search range
-    one_percent = int(range_size * 0.01)
+    one_percent = range_size // 100
     search_start = max(start, theoretical_pos - one_percent)
     search_end = min(end, theoretical_pos + one_percent)
     
@@ -25,7 +53,7 @@ def calculate_theoretical_key(range_start_hex: str, range_end_hex: str, position
         "theoretical_key": {
             "decimal": theoretical_pos,
             "hex": f"{theoretical_pos:x}",
-            "hex_padded": f"{theoretical_pos:064x}"  # Pad to 64 chars for BTC key format
+            "hex_padded": _hex64(theoretical_pos)  # Pad to 64 chars for BTC key format
         },
         "search_range": {
             "start_dec": search_start,
@@ -36,6 +64,11 @@ def calculate_theoretical_key(range_start_hex: str, range_end_hex: str, position
         }
     }
 
+def calculate_theoretical_key_from_float(range_start_hex: str, range_end_hex: str, position_percentage: float):
+    """Calculate theoretical key position from a float percentage (legacy API)."""
+    position_percentage_str = format(Decimal(repr(position_percentage)), 'f')
+    return calculate_theoretical_key(range_start_hex, range_end_hex, position_percentage_str)
+
 def print_results(results):
     """Print results in a readable format."""
     print("\nRange Information:")
@@ -55,16 +88,24 @@ def print_results(results):
     print(f"Search space size: {results['search_range']['size']:,}")
     print(f"Hex range: 0x{results['search_range']['start_hex']} - 0x{results['search_range']['end_hex']}")
 
+def verify_known_keys(results, keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Verify many known keys at once, returning (in_range, position %) arrays."""
+    search_range = results['search_range']
+    values = np.fromiter(
+        (int(key[2:] if key.startswith('0x') else key, 16) for key in keys),
+        dtype=object, count=len(keys)
+    )
+    in_range = (values >= search_range['start_dec']) & (values <= search_range['end_dec'])
+    # Mask first so only in-range offsets (bounded by the search range) reach
+    # int / int division; out-of-range keys can be too large for a float
+    offsets = np.where(in_range, values - search_range['start_dec'], 0)
+    positions = (offsets / (search_range['size'] or 1) * 100).astype(float)
+    return in_range, positions
+
 def verify_known_key(results, known_key):
     """Verify if a known key falls within the predicted range."""
-    if known_key.startswith('0x'):
-        known_key = known_key[2:]
-    key_value = int(known_key, 16)
-    in_range = results['search_range']['start_dec'] <= key_value <= results['search_range']['end_dec']
-    if in_range:
-        position_in_range = (key_value - results['search_range']['start_dec']) / results['search_range']['size'] * 100
-        return True, position_in_range
-    return False, 0
+    in_range, positions = verify_known_keys(results, [known_key])
+    return bool(in_range[0]), float(positions[0])
 
 def get_user_input():
     """Get puzzle parameters from user."""
@@ -76,8 +117,9 @@ def get_user_input():
     
     while True:
         try:
-            position = float(input("Enter position percentage (e.g., 49.28): ").strip())
-            if 0 <= position <= 100:
+            position = input("Enter position percentage (e.g., 49.28): ").strip()
+            num, den = parse_percentage(position)
+            if 0 <= num <= 100 * den:
                 break
             print("Position must be between 0 and 100")
         except ValueError:
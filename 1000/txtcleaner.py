@@ -1,50 +1,86 @@
 import json
+import mmap
+import os
 import re
+from collections import Counter
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import orjson  # C JSON serializer (pip install orjson)
+except ImportError:
+    orjson = None
+
+# Bytes pattern so it can scan an mmap directly.
+# The middle skip excludes ':' so a match never runs into the next entry's range.
+_PUZZLE_PATTERN = (
+    rb"(\d+)\s+"                           # Puzzle number
+    rb"([0-9a-f]+):([0-9a-f]+)\s+"        # Range start:end
+    rb"(0{48}[0-9a-f]+)\s+"               # Private key
+    rb"C\s+([1-9A-HJ-NP-Za-km-z]+)\s+"    # Bitcoin address
+    rb"[^:]*?"                            # Skip middle content
+    rb"SOLVED\s*"                          # Solved marker
+    rb"([\d.]+)%\s+"                       # Position percentage
+    rb"(\d{4}-\d{2}-\d{2})\s+by\s+"       # Date
+    rb"([0-9A-Za-z]+)"                     # Solver
+)
+_PUZZLE_RE = re.compile(_PUZZLE_PATTERN)
+
+@dataclass(slots=True)
+class RangePattern:
+    """Position of a solved key within its puzzle range."""
+    puzzle_number: int
+    range_start_hex: str
+    range_end_hex: str
+    range_start_decimal: int
+    range_end_decimal: int
+    range_size: int
+    key_decimal: int
+    position_in_range: float
+    distance_from_start: int
+    distance_from_end: int
+
+# Parsed-once integers for analysis; kept out of cleaned_puzzles.json
+_PARSED_INT_KEYS = ("range_start_int", "range_end_int", "private_key_int")
+
+def _puzzle_from_match(match):
+    """Build a puzzle record from a pattern match."""
+    puzzle_num, range_start, range_end, private_key, btc_address, \
+    position, solve_date, solver = (group.decode('ascii') for group in match.groups())
+    
+    return {
+        "puzzle_number": int(puzzle_num),
+        "range_start": range_start,
+        "range_end": range_end,
+        "private_key": private_key,
+        "range_start_int": int(range_start, 16),
+        "range_end_int": int(range_end, 16),
+        "private_key_int": int(private_key, 16),
+        "btc_address": btc_address,
+        "position_percentage": float(position),
+        "solve_date": solve_date,
+        "solver": solver
+    }
+
 def parse_puzzle_line(text):
     """Parse a single puzzle entry from the text."""
-    pattern = r"""
-        (\d+)\s+                           # Puzzle number
-        ([0-9a-f]+):([0-9a-f]+)\s+        # Range start:end
-        (0{48}[0-9a-f]+)\s+               # Private key
-        C\s+([1-9A-HJ-NP-Za-km-z]+)\s+    # Bitcoin address
-        .*?                                # Skip middle content
-        SOLVED\s*                          # Solved marker
-        ([\d.]+)%\s+                       # Position percentage
-        (\d{4}-\d{2}-\d{2})\s+by\s+       # Date
-        ([0-9A-Za-z]+)                     # Solver
-    """
-    match = re.search(pattern, text, re.VERBOSE | re.DOTALL)
-    if match:
-        puzzle_num, range_start, range_end, private_key, btc_address, \
-        position, solve_date, solver = match.groups()
-        
-        return {
-            "puzzle_number": int(puzzle_num),
-            "range_start": range_start,
-            "range_end": range_end,
-            "private_key": private_key,
-            "btc_address": btc_address,
-            "position_percentage": float(position),
-            "solve_date": solve_date,
-            "solver": solver
-        }
-    return None
+    if isinstance(text, str):
+        text = text.encode()
+    match = _PUZZLE_RE.search(text)
+    return _puzzle_from_match(match) if match else None
 
-def clean_puzzle_data(text):
-    """Clean and structure the puzzle data."""
-    # Split text into puzzle entries (split on puzzle numbers)
-    entries = re.split(r'\n(?=\d+\s+[0-9a-f]+:[0-9a-f]+\s+)', text.strip())
-    puzzles = []
-    
-    for entry in entries:
-        if entry.strip():
-            parsed = parse_puzzle_line(entry.strip())
-            if parsed:
-                puzzles.append(parsed)
-    
-    return puzzles
+def clean_puzzle_data(data):
+    """Clean and structure the puzzle data in a single pass over str, bytes or an mmap."""
+    if isinstance(data, str):
+        data = data.encode()
+    return [_puzzle_from_match(match) for match in _PUZZLE_RE.finditer(data)]
+
+def strip_parsed_ints(puzzles):
+    """Return puzzle records without the analysis-only integer fields."""
+    return [{key: value for key, value in puzzle.items() if key not in _PARSED_INT_KEYS}
+            for puzzle in puzzles]
 
 def analyze_puzzle_data(puzzles):
     """Analyze the cleaned puzzle data."""
@@ -62,7 +98,7 @@ def analyze_puzzle_data(puzzles):
     # Sort puzzles by solve date
     puzzles.sort(key=lambda x: x['solve_date'])
     
-    solver_counts = {}
+    solver_counts = Counter(puzzle['solver'] for puzzle in puzzles)
     position_stats = {
         'min': float('inf'),
         'max': float('-inf'),
@@ -70,40 +106,36 @@ def analyze_puzzle_data(puzzles):
         'count': len(puzzles)
     }
     
-    # Additional analysis for range patterns
-    range_patterns = []
-    
     for puzzle in puzzles:
-        # Solver statistics
-        solver = puzzle['solver']
-        solver_counts[solver] = solver_counts.get(solver, 0) + 1
-        
         # Position statistics
         pos = puzzle['position_percentage']
         position_stats['min'] = min(position_stats['min'], pos)
         position_stats['max'] = max(position_stats['max'], pos)
         position_stats['total'] += pos
-        
-        # Range analysis
-        range_start = int(puzzle['range_start'], 16)
-        range_end = int(puzzle['range_end'], 16)
-        key_value = int(puzzle['private_key'], 16)
-        
-        range_size = range_end - range_start
-        position_in_range = ((key_value - range_start) / range_size * 100) if range_size > 0 else 100
-        
-        range_patterns.append({
-            'puzzle_number': puzzle['puzzle_number'],
-            'range_start_hex': puzzle['range_start'],
-            'range_end_hex': puzzle['range_end'],
-            'range_start_decimal': range_start,
-            'range_end_decimal': range_end,
-            'range_size': range_size,
-            'key_decimal': key_value,
-            'position_in_range': position_in_range,
-            'distance_from_start': key_value - range_start,
-            'distance_from_end': range_end - key_value
-        })
+    
+    # Additional analysis for range patterns, vectorised over all puzzles
+    # (object dtype, values exceed int64); hex fields were parsed at match time
+    range_starts = np.array([p['range_start_int'] for p in puzzles], dtype=object)
+    range_ends = np.array([p['range_end_int'] for p in puzzles], dtype=object)
+    key_values = np.array([p['private_key_int'] for p in puzzles], dtype=object)
+    
+    range_sizes = range_ends - range_starts
+    distances_from_start = key_values - range_starts
+    distances_from_end = range_ends - key_values
+    
+    # Single-value ranges report 100 without dividing by zero
+    valid = range_sizes > 0
+    # Object arrays divide int by int, so Python rounds each quotient exactly once
+    positions = distances_from_start / np.where(valid, range_sizes, 1) * 100
+    positions_in_range = np.where(valid, positions, 100)
+    
+    range_patterns = [
+        RangePattern(puzzle['puzzle_number'], puzzle['range_start'], puzzle['range_end'], *row)
+        for puzzle, row in zip(puzzles, zip(
+            range_starts.tolist(), range_ends.tolist(), range_sizes.tolist(),
+            key_values.tolist(), positions_in_range.tolist(),
+            distances_from_start.tolist(), distances_from_end.tolist()))
+    ]
     
     if position_stats['count'] > 0:
         position_stats['average'] = position_stats['total'] / position_stats['count']
@@ -115,8 +147,7 @@ def analyze_puzzle_data(puzzles):
     analysis = {
         'total_puzzles': len(puzzles),
         'unique_solvers': len(solver_counts),
-        'top_solvers': [{'solver': s, 'count': c} for s, c in 
-                       sorted(solver_counts.items(), key=lambda x: x[1], reverse=True)[:5]],
+        'top_solvers': [{'solver': s, 'count': c} for s, c in solver_counts.most_common(5)],
         'position_stats': position_stats,
         'first_solve': puzzles[0]['solve_date'] if puzzles else None,
         'last_solve': puzzles[-1]['solve_date'] if puzzles else None,
@@ -129,18 +160,20 @@ def analyze_puzzle_data(puzzles):
 
 def main():
     try:
-        # Read the input file as text
-        with open('prevsolv.txt', 'r') as file:
-            data = file.read()
+        # Map the input file and parse it in one pass (mmap rejects empty files)
+        with open('prevsolv.txt', 'rb') as file:
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    puzzles = clean_puzzle_data(data)
+            else:
+                puzzles = []
         
-        # Clean and parse the data
-        puzzles = clean_puzzle_data(data)
         if not puzzles:
             print("Error: No valid puzzle data found in input file")
             return
         
         # Save cleaned data
-        save_json(puzzles, 'cleaned_puzzles.json')
+        save_json(strip_parsed_ints(puzzles), 'cleaned_puzzles.json')
         print("Cleaned puzzle data saved to cleaned_puzzles.json")
         
         # Analyze and save analysis
@@ -165,21 +198,40 @@ def main():
         # Print range pattern summary for first few puzzles
         print("\nRange Pattern Examples (first 3 puzzles):")
         for pattern in analysis['range_patterns'][:3]:
-            print(f"\nPuzzle {pattern['puzzle_number']}:")
-            print(f"  Range: {pattern['range_start_hex']}:{pattern['range_end_hex']}")
-            print(f"  Position in range: {pattern['position_in_range']:.2f}%")
-            print(f"  Distance from start: {pattern['distance_from_start']:,}")
-            print(f"  Distance from end: {pattern['distance_from_end']:,}")
+            print(f"\nPuzzle {pattern.puzzle_number}:")
+            print(f"  Range: {pattern.range_start_hex}:{pattern.range_end_hex}")
+            print(f"  Position in range: {pattern.position_in_range:.2f}%")
+            print(f"  Distance from start: {pattern.distance_from_start:,}")
+            print(f"  Distance from end: {pattern.distance_from_end:,}")
         
     except FileNotFoundError:
         print("Error: Input file 'prevsolv.txt' not found")
     except Exception as e:
         print(f"Error processing data: {str(e)}")
 
+def _dumps_orjson(data):
+    """Serialize with orjson, or return None if unavailable or an int exceeds 64 bits."""
+    if orjson is None:
+        return None
+    try:
+        # Dataclasses go through asdict so their keys are sorted like dicts
+        return orjson.dumps(data, default=asdict,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                                   | orjson.OPT_PASSTHROUGH_DATACLASS)
+    except orjson.JSONEncodeError:
+        return None
+
 def save_json(data, filename):
     """Save data to a JSON file with proper formatting."""
+    payload = _dumps_orjson(data)
+    if payload is not None:
+        with open(filename, 'wb') as f:
+            f.write(payload)
+        return
+    
+    # Stdlib fallback also covers arbitrary-width integers (e.g. 256-bit keys)
     with open(filename, 'w') as f:
-        json.dump(data, f, indent=2, sort_keys=True)
+        json.dump(data, f, indent=2, sort_keys=True, default=asdict)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,35 +1,68 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+
 import cv2
-import numpy as np
 from PIL import Image
 import stepic
 
+# CLAHE objects are reusable across calls; build the CPU one once
+_CLAHE = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+
+@lru_cache(maxsize=None)
+def cuda_available():
+    """Check for a CUDA device and an OpenCV build with CUDA image processing."""
+    # Evaluated lazily so forked workers, not the parent, initialise CUDA
+    try:
+        return (cv2.cuda.getCudaEnabledDeviceCount() > 0
+                and hasattr(cv2.cuda, 'createCLAHE'))
+    except (AttributeError, cv2.error):
+        return False
+
+@lru_cache(maxsize=None)
+def _cuda_clahe():
+    """Create the GPU CLAHE object once per process, after CUDA is known to be usable."""
+    return cv2.cuda.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+
+def enhance_contrast_cuda(image):
+    """Increase contrast and brightness on the GPU."""
+    stream = cv2.cuda_Stream()
+    gpu_image = cv2.cuda_GpuMat()
+    gpu_image.upload(image, stream)
+    
+    # Convert, equalise and convert back without leaving the device
+    gpu_lab = cv2.cuda.cvtColor(gpu_image, cv2.COLOR_BGR2LAB, stream=stream)
+    l, a, b = cv2.cuda.split(gpu_lab, stream=stream)
+    enhanced_l = _cuda_clahe().apply(l, stream)
+    enhanced_lab = cv2.cuda.merge([enhanced_l, a, b], stream=stream)
+    gpu_enhanced = cv2.cuda.cvtColor(enhanced_lab, cv2.COLOR_LAB2BGR, stream=stream)
+    
+    enhanced = gpu_enhanced.download(stream)
+    stream.waitForCompletion()
+    return enhanced
+
 def enhance_contrast(image):
     """Increase contrast and brightness."""
+    if cuda_available():
+        return enhance_contrast_cuda(image)
+    
     lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-    l, a, b = cv2.split(lab)
     
-    # Apply CLAHE to L channel
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    enhanced_l = clahe.apply(l)
+    # Apply CLAHE to L channel, writing back into the LAB buffer in place
+    lab[:, :, 0] = _CLAHE.apply(lab[:, :, 0])
     
-    # Merge channels back
-    enhanced_lab = cv2.merge([enhanced_l, a, b])
-    enhanced = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2BGR)
-    return enhanced
+    return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
 
-def detect_edges(image):
-    """Apply multiple edge detection methods."""
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    
+def detect_edges(gray):
+    """Apply multiple edge detection methods to a grayscale image."""
     # Canny edge detection
     canny = cv2.Canny(gray, 50, 150)
     
     # Sobel edge detection
-    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-    sobel = np.sqrt(sobel_x**2 + sobel_y**2)
-    sobel = np.uint8(sobel * 255 / np.max(sobel))
+    sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+    magnitude = cv2.magnitude(sobel_x, sobel_y)
+    sobel = cv2.normalize(magnitude, None, alpha=255, norm_type=cv2.NORM_INF, dtype=cv2.CV_8U)
     
     return canny, sobel
 
@@ -45,55 +78,100 @@ def analyze_channels(image):
     
     return heatmap_b, heatmap_g, heatmap_r
 
-def extract_hidden_data(image_path):
-    """Try to extract hidden data using stepic."""
+def extract_hidden_data(image):
+    """Try to extract hidden data from an already-decoded BGR image using stepic."""
     try:
-        img = Image.open(image_path)
+        img = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
         hidden_data = stepic.decode(img)
         return hidden_data if hidden_data else "No hidden data found"
     except Exception as e:
         return f"Error extracting data: {str(e)}"
 
-def process_image(image_path):
-    """Process image with multiple techniques to reveal hidden content."""
-    # Load image
-    image = cv2.imread(image_path)
-    if image is None:
-        print(f"Error: Could not load image from {image_path}")
-        return
+def write_image(path, image):
+    """Write one image, raising instead of cv2.imwrite's silent False on failure."""
+    if not cv2.imwrite(path, image):
+        raise OSError(f"Could not write image to {path}")
 
-    # Create output directory
-    import os
-    output_dir = "analysis_output"
-    os.makedirs(output_dir, exist_ok=True)
+def write_images(output_dir, images):
+    """Write named images concurrently; cv2.imwrite releases the GIL while compressing."""
+    paths = {f"{output_dir}/{name}": image for name, image in images.items()}
+    if len(paths) == 1:
+        write_image(*next(iter(paths.items())))
+        return
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(write_image, path, image) for path, image in paths.items()]
+    for future in futures:
+        future.result()  # Re-raise any write failure
 
-    # 1. Enhanced contrast
+# Pipeline stages are top-level so they can be pickled into worker processes
+def enhance_task(image, output_dir):
+    """Stage 1: contrast enhancement."""
     enhanced = enhance_contrast(image)
-    cv2.imwrite(f"{output_dir}/enhanced.png", enhanced)
+    write_images(output_dir, {"enhanced.png": enhanced})
 
-    # 2. Edge detection
-    canny, sobel = detect_edges(image)
-    cv2.imwrite(f"{output_dir}/edges_canny.png", canny)
-    cv2.imwrite(f"{output_dir}/edges_sobel.png", sobel)
+def edges_task(gray, output_dir):
+    """Stage 2: edge detection."""
+    canny, sobel = detect_edges(gray)
+    write_images(output_dir, {"edges_canny.png": canny, "edges_sobel.png": sobel})
 
-    # 3. Channel analysis
+def channels_task(image, output_dir):
+    """Stage 3: channel heatmaps."""
     heatmap_b, heatmap_g, heatmap_r = analyze_channels(image)
-    cv2.imwrite(f"{output_dir}/heatmap_blue.png", heatmap_b)
-    cv2.imwrite(f"{output_dir}/heatmap_green.png", heatmap_g)
-    cv2.imwrite(f"{output_dir}/heatmap_red.png", heatmap_r)
+    write_images(output_dir, {
+        "heatmap_blue.png": heatmap_b,
+        "heatmap_green.png": heatmap_g,
+        "heatmap_red.png": heatmap_r,
+    })
 
-    # 4. Try different threshold techniques
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def threshold_task(gray, output_dir):
+    """Stage 4: binary and adaptive thresholding."""
     _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
     adaptive = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
                                    cv2.THRESH_BINARY, 11, 2)
-    cv2.imwrite(f"{output_dir}/threshold_binary.png", binary)
-    cv2.imwrite(f"{output_dir}/threshold_adaptive.png", adaptive)
+    write_images(output_dir, {
+        "threshold_binary.png": binary,
+        "threshold_adaptive.png": adaptive,
+    })
 
-    # 5. Extract hidden data
-    hidden_data = extract_hidden_data(image_path)
+def hidden_data_task(image, output_dir):
+    """Stage 5: hidden data extraction."""
+    hidden_data = extract_hidden_data(image)
     with open(f"{output_dir}/hidden_data.txt", 'w') as f:
         f.write(hidden_data)
+    return hidden_data
+
+def process_image(image_path, output_dir="analysis_output", max_workers=5):
+    """Process image with multiple techniques to reveal hidden content."""
+    # Load image
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"Error: Could not load image from {image_path}")
+        return
+
+    # Decode and convert to grayscale once, shared by all stages
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Hidden data extraction goes last so its result can be picked out
+    stages = (
+        (enhance_task, image),
+        (edges_task, gray),
+        (channels_task, image),
+        (threshold_task, gray),
+        (hidden_data_task, image),
+    )
+
+    # Run the independent stages in parallel, one worker per stage
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(stage, data, output_dir) for stage, data in stages]
+            wait(futures)
+            results = [future.result() for future in futures]  # Re-raise any stage failure
+    else:
+        results = [stage(data, output_dir) for stage, data in stages]
+    hidden_data = results[-1]
 
     print(f"""
 Image Analysis Complete!
@@ -109,6 +187,15 @@ Results saved in '{output_dir}' directory:
 Hidden data found: {hidden_data}
     """)
 
+def process_images(image_paths, max_workers=None):
+    """Process several images in parallel, one output directory per image."""
+    # The index keeps directories unique when inputs share a file stem
+    output_dirs = [f"analysis_output_{i}_{os.path.splitext(os.path.basename(path))[0]}"
+                   for i, path in enumerate(image_paths)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # Each image runs its stages serially inside its own worker
+        list(pool.map(process_image, image_paths, output_dirs, [1] * len(image_paths)))
+
 if __name__ == "__main__":
     # Install required packages if not already installed
     # pip install opencv-python pillow stepic numpy